@@ -1,20 +1,30 @@
+# Import packages and modules | Standard
+import re
+from functools import lru_cache
+
 # Import packages and modules | External
+import numpy as np
+import pandas as pd
 import streamlit as st
 
 # Page configuration
-with st.spinner(text="Loading...", show_time=True):
-    # Configure the page
-    st.set_page_config(
-        page_title="SalaryInHand",
-        page_icon=":material/currency_rupee_circle:",
-        layout="centered",
-        initial_sidebar_state="auto",
-        menu_items={
-            "Get Help": f"mailto:yvsravan2000@gmail.com"
-        }
-    )
+st.set_page_config(
+    page_title="SalaryInHand",
+    page_icon=":material/currency_rupee_circle:",
+    layout="centered",
+    initial_sidebar_state="auto",
+    menu_items={
+        "Get Help": f"mailto:yvsravan2000@gmail.com"
+    }
+)
 
 ############################### Page functions ###############################
+# Matches every digit followed by an even number of digits (possibly none) and then the last three digits,
+# i.e. the positions after which Indian style commas go (e.g., 123456789 -> 12,34,56,789)
+_INDIAN_COMMA_RE = re.compile(r"(\d)(?=(?:\d\d)*\d\d\d$)")
+
+
+@lru_cache(maxsize=1024)
 def indian_number_format(amount: float) -> str:
     """
     Formats a given number in the Indian number system (e.g., 12,34,56,789.00).
@@ -41,24 +51,28 @@ def indian_number_format(amount: float) -> str:
     integer_part, _, decimal_part = f"{amount:.2f}".partition('.')
 
     # Format the integer part using Indian style commas
-    n = len(integer_part)
-    if n <= 3:
-        # If 3 or fewer digits, no additional commas needed
-        formatted = integer_part
-    else:
-        # Start with the rightmost 3 digits
-        formatted = integer_part[-3:]
-        integer_part = integer_part[:-3]
-        # Add commas after every 2 digits in the remaining part
-        while len(integer_part) > 0:
-            formatted = integer_part[-2:] + ',' + formatted
-            integer_part = integer_part[:-2]
-
-    # Combine integer and decimal parts
-    result = f"{formatted}.{decimal_part}"
-
-    # Prefix minus sign if original amount was negative
-    return f"-{result}" if is_negative else result
+    formatted = _INDIAN_COMMA_RE.sub(r"\1,", integer_part)
+
+    # Combine integer and decimal parts, prefixing a minus sign if the original amount was negative
+    return f"{'-' if is_negative else ''}{formatted}.{decimal_part}"
+
+
+# Progressive income tax slabs as (income limit, tax rate), ordered from highest to lowest bracket
+_TAX_BRACKETS = (
+    (2400000, 0.30),  # 30% for income above 24,00,000
+    (2000000, 0.25),  # 25% for income above 20,00,000
+    (1600000, 0.20),  # 20% for income above 16,00,000
+    (1200000, 0.15),  # 15% for income above 12,00,000
+    (800000,  0.10),  # 10% for income above 8,00,000
+    (400000,  0.05),  # 5% for income above 4,00,000
+)
+
+# Marginal rate increase at each bracket limit, as (income limit, rate delta) pairs.
+# Income above a limit pays every delta at or below it, which sums to the bracket rate.
+_TAX_RATE_DELTAS = tuple(
+    (limit, rate - lower_rate)
+    for (limit, rate), (_, lower_rate) in zip(_TAX_BRACKETS, _TAX_BRACKETS[1:] + ((0, 0.0),))
+)
 
 
 def calculate_tax(taxable_amount: float) -> float:
@@ -73,29 +87,120 @@ def calculate_tax(taxable_amount: float) -> float:
 
     Function Description:
         Given a taxable amount, the function computes income tax using predefined
-        slab rates as per Indian standards. For every bracket amount exceeded, the tax
-        is calculated at the bracket rate and summed cumulatively.
+        slab rates as per Indian standards. Each slab limit raises the marginal rate
+        by a fixed delta, so the tax is the sum of the income above every limit
+        multiplied by that limit's delta, with no running state between slabs.
     """
-    # List of (income limit, tax rate) tuples, ordered from highest to lowest bracket
-    brackets = [
-        (2400000, 0.30),  # 30% for income above 24,00,000
-        (2000000, 0.25),  # 25% for income above 20,00,000
-        (1600000, 0.20),  # 20% for income above 16,00,000
-        (1200000, 0.15),  # 15% for income above 12,00,000
-        (800000,  0.10),  # 10% for income above 8,00,000
-        (400000,  0.05),  # 5% for income above 4,00,000
-    ]
-
-    tax_value = 0.0
-
-    # For each bracket, if there is surplus income above the limit,
-    # apply the bracket's rate and reduce the amount for further calculation
-    for limit, rate in brackets:
-        if taxable_amount > limit:
-            tax_value += (taxable_amount - limit) * rate
-            taxable_amount = limit  # Only lower bracket rates apply on remaining amount
-
-    return tax_value
+    return sum(max(taxable_amount - limit, 0.0) * delta for limit, delta in _TAX_RATE_DELTAS)
+
+
+# Bracket limits and rate deltas as arrays, for evaluating the tax over many amounts at once
+_TAX_LIMITS = np.array([limit for limit, _ in _TAX_RATE_DELTAS], dtype=np.float64)
+_TAX_DELTAS = np.array([delta for _, delta in _TAX_RATE_DELTAS], dtype=np.float64)
+
+
+def calculate_tax_array(taxable_amounts: np.ndarray) -> np.ndarray:
+    """
+    Calculate the income tax for an array of taxable amounts.
+
+    Args:
+        taxable_amounts (np.ndarray): One-dimensional array of taxable incomes (a scalar is treated as one amount).
+
+    Returns:
+        np.ndarray: The tax for each taxable amount, matching calculate_tax element-wise.
+
+    Function Description:
+        Vectorized counterpart of calculate_tax for batch use such as plotting a tax
+        curve. Every amount is compared against every slab limit through broadcasting,
+        so no Python loop runs per amount. For a single amount, calculate_tax is faster.
+    """
+    taxable_amounts = np.atleast_1d(np.asarray(taxable_amounts, dtype=np.float64))
+    return ((taxable_amounts[:, None] - _TAX_LIMITS).clip(min=0.0) * _TAX_DELTAS).sum(axis=1)
+
+
+# Salary structure rates: basic salary as a share of the fixed gross salary,
+# and PF and gratuity contributions as shares of the basic salary
+_BASIC_RATE = 0.40
+_PF_RATE = 0.12
+_GRATUITY_RATE = 0.048
+
+# The same contributions folded into rates on the fixed gross salary, computed once at import
+_NPS_PCT_FIXED_RATE = _BASIC_RATE / 100  # Per percentage point of NPS contribution
+_PF_FIXED_RATE = _BASIC_RATE * _PF_RATE
+_GRATUITY_FIXED_RATE = _BASIC_RATE * _GRATUITY_RATE
+
+# Standard deduction under the new tax regime (reduces the taxable amount, not the salary paid out)
+_STANDARD_DEDUCTION = 75000
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def compute_salary(fixed_salary: float, variable_pay_pct: float, nps_pct: float) -> dict[str, float]:
+    """
+    Compute the salary breakup and in-hand salary for the given inputs.
+
+    Args:
+        fixed_salary (float): The fixed gross salary including allowances, per year.
+        variable_pay_pct (float): Variable pay as a percentage of the fixed gross salary.
+        nps_pct (float): Employer NPS contribution as a percentage of the basic salary.
+
+    Returns:
+        dict[str, float]: Yearly amounts for every salary component, keyed by component name.
+
+    Function Description:
+        This function derives every salary component from the form inputs under the new
+        tax regime. It is cached by Streamlit on its arguments, so resubmitting the form
+        with unchanged inputs returns the stored breakup instead of recomputing it.
+    """
+    # Calculate the variable pay based on user input percentage
+    variable_pay = fixed_salary * (variable_pay_pct / 100)
+
+    # Calculate the ctc (Cost to Company)
+    ctc_amount = fixed_salary + variable_pay
+
+    # Calculate the basic salary
+    basic_salary = fixed_salary * _BASIC_RATE
+
+    # Calculate the employer's NPS contribution (nps_pct% of basic salary)
+    employer_nps_contribution = fixed_salary * (nps_pct * _NPS_PCT_FIXED_RATE)
+
+    # Calculate the employer's PF contribution
+    employer_pf_contribution = fixed_salary * _PF_FIXED_RATE
+
+    # Calculate the employee PF contribution (same rate as the employer's PF contribution)
+    employee_pf_contribution = employer_pf_contribution
+
+    # Calculate the gratuity contribution
+    gratuity_contribution = fixed_salary * _GRATUITY_FIXED_RATE
+
+    # Calculate the professional tax (assuming a flat rate of 300 per month)
+    professional_tax = 300 * 12
+
+    # Calculate the taxable amount
+    taxable_amount = fixed_salary - employer_nps_contribution - employer_pf_contribution - gratuity_contribution - _STANDARD_DEDUCTION
+
+    # Calculate the tax amount
+    tax_amount = calculate_tax(taxable_amount)
+
+    # Calculate the CESS amount
+    cess_amount = 0.04 * tax_amount
+
+    # Calculate the in-hand salary (adding back the standard deduction, which is not paid out of the salary)
+    in_hand_salary = taxable_amount + _STANDARD_DEDUCTION - employee_pf_contribution - professional_tax - tax_amount - cess_amount
+
+    return {
+        "ctc_amount": ctc_amount,
+        "variable_pay": variable_pay,
+        "basic_salary": basic_salary,
+        "employer_nps_contribution": employer_nps_contribution,
+        "employer_pf_contribution": employer_pf_contribution,
+        "employee_pf_contribution": employee_pf_contribution,
+        "gratuity_contribution": gratuity_contribution,
+        "professional_tax": professional_tax,
+        "taxable_amount": taxable_amount,
+        "tax_amount": tax_amount,
+        "cess_amount": cess_amount,
+        "in_hand_salary": in_hand_salary,
+    }
 
 ############################### Page contents ###############################
 # Title
@@ -107,7 +212,7 @@ with st.form(key="inhand_salary_input_form", clear_on_submit=False, enter_to_sub
     col1, col2, col3 = st.columns(3)
 
     # Input for salary
-    inp_fixed_salary = float(col1.number_input(
+    inp_fixed_salary = col1.number_input(
         label="Fixed Gross Salary Including Allowances (in INR)",
         min_value=0.0,
         value=1800000.0,
@@ -115,10 +220,10 @@ with st.form(key="inhand_salary_input_form", clear_on_submit=False, enter_to_sub
         format="%.2f",
         placeholder="12345567.89",
         help="Enter your gross salary to calculate the tax amount."
-    ))
+    )
 
     # Input for variable pay (disabled, assumed 8% of fixed gross salary)
-    inp_variable_pay = float(col2.number_input(
+    inp_variable_pay = col2.number_input(
         label="Variable Pay (% of fixed gross salary)",
         min_value=0.0,
         max_value=14.0,
@@ -128,10 +233,10 @@ with st.form(key="inhand_salary_input_form", clear_on_submit=False, enter_to_sub
         placeholder="8.00",
         help="Variable pay is assumed to be 8% of the fixed gross salary.",
         disabled=False
-    ))
+    )
 
     # Input for Employer NPS contribution
-    inp_nps = float(col3.number_input(
+    inp_nps = col3.number_input(
         label="Employer NPS Contribution (% of basic salary)",
         min_value=0.0,
         max_value=14.0,
@@ -140,7 +245,7 @@ with st.form(key="inhand_salary_input_form", clear_on_submit=False, enter_to_sub
         format="%.2f",
         placeholder="14.00",
         help="Enter the employer's NPS contribution to calculate the in-hand salary."
-    ))
+    )
 
     # Input for tax regime
     inp_tax_regime = st.selectbox(
@@ -160,98 +265,66 @@ with st.form(key="inhand_salary_input_form", clear_on_submit=False, enter_to_sub
 
 if(submit_button_clicked):
     with st.spinner(text="Calculating...", show_time=True):
-        # Calculate the variable pay based on user input percentage
-        variable_pay = inp_fixed_salary * (inp_variable_pay / 100)
-
-        # Calculate the ctc (Cost to Company)
-        ctc_amount = inp_fixed_salary + variable_pay
-
-        # Calculate the basic salary (assuming 40% of fixed gross salary)
-        basic_salary = inp_fixed_salary * 0.40
-
-        # Calculate the employer's NPS contribution
-        employer_nps_contribution = (inp_nps / 100) * basic_salary
-
-        # Calculate the employer's PF contribution
-        employer_pf_contribution = 0.12 * basic_salary
-
-        # Calculate the employee PF contribution
-        employee_pf_contribution = 0.12 * basic_salary
+        # Calculate the salary breakup (cached on the form inputs)
+        salary = compute_salary(inp_fixed_salary, inp_variable_pay, inp_nps)
+
+        # Build the Calculations table (yearly amounts by component; st.table renders the component labels as markdown)
+        calc_df = pd.DataFrame(
+            {
+                "Amount (₹)": [
+                    salary["ctc_amount"],
+                    salary["variable_pay"],
+                    salary["basic_salary"],
+                    salary["employer_nps_contribution"],
+                    salary["employer_pf_contribution"],
+                    salary["employee_pf_contribution"],
+                    salary["gratuity_contribution"],
+                    salary["professional_tax"],
+                ]
+            },
+            index=pd.Index(
+                [
+                    "CTC Amount",
+                    f":red[*]Variable Pay ({inp_variable_pay:.1f}% of Fixed Salary)",
+                    f"Basic Salary ({_BASIC_RATE:.0%} of Fixed Salary)",
+                    f"Employer NPS Contribution ({inp_nps:.1f}% of Basic Salary)",
+                    f"Employer PF Contribution ({_PF_RATE:.0%} of Basic Salary)",
+                    f"Employee PF Contribution ({_PF_RATE:.0%} of Basic Salary)",
+                    f"Gratuity Contribution ({_GRATUITY_RATE:.1%} of Basic Salary)",
+                    "Professional Tax (Flat Rate)",
+                ],
+                name="Component",
+            ),
+        )
+
+        # Build the In-Hand Salary table (yearly and monthly amounts by component)
+        inhand_yearly = pd.Series(
+            {
+                "CTC": salary["ctc_amount"],
+                "Gross Salary": inp_fixed_salary,
+                "Taxable Amount": salary["taxable_amount"],
+                "Income Tax Amount": salary["tax_amount"],
+                "Health & Education CESS Amount": salary["cess_amount"],
+                "PF & Pension": salary["employer_nps_contribution"] + salary["employer_pf_contribution"] + salary["employee_pf_contribution"],
+                "**Net Salary**": salary["in_hand_salary"],
+            }
+        )
+        inhand_df = pd.DataFrame({"Amount/Year (₹)": inhand_yearly, "Amount/Month (₹)": inhand_yearly / 12})
+        inhand_df.index.name = "Component"
 
-        # Calculate the gratuity contribution (assuming 4.8% of basic salary)
-        gratuity_contribution = 0.048 * basic_salary
-
-        # Calculate the professional tax (assuming a flat rate of 300 per month)
-        professional_tax = 300 * 12
-
-        # Calculate the taxable amount
-        taxable_amount = inp_fixed_salary - employer_nps_contribution - employer_pf_contribution - gratuity_contribution - 75000
-
-        # Calculate the tax amount
-        tax_amount = calculate_tax(taxable_amount)
-
-        # Calculate the CESS amount
-        cess_amount = 0.04 * tax_amount
-
-        # Calculate the in-hand salary
-        in_hand_salary = inp_fixed_salary - employer_nps_contribution - employer_pf_contribution - gratuity_contribution - employee_pf_contribution - professional_tax - tax_amount - cess_amount
-        
         # Display results
         st.toast(body="In-hand salary calculated successfully!", icon=":material/check_circle:")
         with st.expander("Calculations", expanded=False):
-            st.markdown(
-                """
-                | Component | Amount (₹) |
-                |-----------|------------|
-                | CTC Amount | {} |
-                | :red[*]Variable Pay ({:.1f}% of Fixed Salary) | {} |
-                | Basic Salary (40% of Fixed Salary) | {} |
-                | Employer NPS Contribution ({:.1f}% of Basic Salary) | {} |
-                | Employer PF Contribution (12% of Basic Salary) | {} |
-                | Employee PF Contribution (12% of Basic Salary) | {} |
-                | Gratuity Contribution (4.8% of Basic Salary) | {} |
-                | Professional Tax (Flat Rate) | {} |
-                """.format(
-                    indian_number_format(ctc_amount),
-                    inp_variable_pay,
-                    indian_number_format(variable_pay),
-                    indian_number_format(basic_salary),
-                    inp_nps,
-                    indian_number_format(employer_nps_contribution),
-                    indian_number_format(employer_pf_contribution),
-                    indian_number_format(employee_pf_contribution),
-                    indian_number_format(gratuity_contribution),
-                    indian_number_format(professional_tax)
-                )
-            )
+            st.table(calc_df.style.format(indian_number_format))
             st.markdown(":red[*]_Not considered as taxable income._")
 
         with st.expander("In-Hand Salary", expanded=True):
-            st.markdown(
-                """
-                | Component | Amount/Year (₹) | Amount/Month (₹) |
-                |-----------|------------------|------------------|
-                | CTC | {} | {} |
-                | Gross Salary | {} | {} |
-                | Taxable Amount | {} | {} |
-                | Income Tax Amount | {} | {} |
-                | Health & Education CESS Amount | {} | {} |
-                | PF & Pension | {} | {} |
-                | **Net Salary** | **{}** | **:green-background[:green[{}]]** |
-                """.format(
-                    indian_number_format(ctc_amount),
-                    indian_number_format(ctc_amount / 12),
-                    indian_number_format(inp_fixed_salary),
-                    indian_number_format(inp_fixed_salary / 12),
-                    indian_number_format(taxable_amount),
-                    indian_number_format(taxable_amount / 12),
-                    indian_number_format(tax_amount),
-                    indian_number_format(tax_amount / 12),
-                    indian_number_format(cess_amount),
-                    indian_number_format(cess_amount / 12),
-                    indian_number_format(employer_nps_contribution + employer_pf_contribution + employee_pf_contribution),
-                    indian_number_format((employer_nps_contribution + employer_pf_contribution + employee_pf_contribution) / 12),
-                    indian_number_format(in_hand_salary),
-                    indian_number_format(in_hand_salary / 12)
+            st.table(
+                inhand_df.style
+                .format(indian_number_format)
+                .set_properties(subset=pd.IndexSlice[["**Net Salary**"], :], **{"font-weight": "bold"})
+                .set_properties(
+                    subset=pd.IndexSlice[["**Net Salary**"], ["Amount/Month (₹)"]],
+                    **{"color": "green", "background-color": "rgba(33, 195, 84, 0.1)"}
                 )
             )